@@ -478,7 +478,7 @@ if [[ ! -d "${APP_DIR}/venv" ]]; then
   python3 -m venv "${APP_DIR}/venv"
 fi
 "${APP_DIR}/venv/bin/pip" install --upgrade pip >/tmp/pi-kiosk-pip.log
-"${APP_DIR}/venv/bin/pip" install --upgrade --force-reinstall "${REPO_ROOT}" >>/tmp/pi-kiosk-pip.log
+"${APP_DIR}/venv/bin/pip" install --upgrade --force-reinstall "${REPO_ROOT}[xlib]" >>/tmp/pi-kiosk-pip.log
 
 install -m 755 "${REPO_ROOT}/src/launch_kiosk.sh" /usr/local/bin/launch_kiosk.sh
 install -m 755 "${REPO_ROOT}/src/kiosk_xsession.sh" /usr/local/bin/kiosk_xsession.sh
@@ -1,119 +1,199 @@
 from __future__ import annotations
 
+import math
 import os
-import shlex
+import re
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import Iterable
-
-from pydantic import (
-    AnyHttpUrl,
-    BaseModel,
-    Field,
-    FieldValidationInfo,
-    ValidationError,
-    field_validator,
-)
+from typing import Iterable, Mapping, Optional
 
 
 DEFAULT_CONFIG_PATH = Path("/etc/pi-kiosk/kiosk.env")
 
+_URL_RE = re.compile(r"^https?://[^\s]+$")
+_TRUE_VALUES = frozenset({"1", "true", "t", "yes", "y", "on"})
+_FALSE_VALUES = frozenset({"0", "false", "f", "no", "n", "off"})
+_LOG_LEVELS = frozenset({"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"})
+
 
 class ConfigError(RuntimeError):
     """Raised when configuration cannot be loaded or validated."""
 
 
-class KioskConfig(BaseModel):
-    model_config = {"extra": "ignore"}
-
-    ha_base_url: AnyHttpUrl = Field(validation_alias="HA_BASE_URL")
-    ha_extra_query: str = Field(
-        default="", validation_alias="HA_EXTRA_QUERY", description="Query string additions appended to the HA URL."
-    )
-    ha_long_lived_token: str | None = Field(
-        default=None, validation_alias="HA_LONG_LIVED_TOKEN"
-    )
-
-    distance_threshold_mm: int = Field(
-        default=1500, validation_alias="DISTANCE_THRESHOLD_MM", ge=100, le=5000
-    )
-    inactivity_timeout_sec: int = Field(
-        default=90, validation_alias="INACTIVITY_TIMEOUT_SEC", ge=5, le=3600
-    )
-    poll_interval_sec: float = Field(
-        default=0.5, validation_alias="POLL_INTERVAL_SEC", ge=0.1, le=5.0
-    )
-
-    brightness_min: int = Field(
-        default=10, validation_alias="BRIGHTNESS_MIN", ge=0, le=255
-    )
-    brightness_max: int = Field(
-        default=255, validation_alias="BRIGHTNESS_MAX", ge=1, le=255
-    )
-    brightness_lux_max: float = Field(
-        default=400.0, validation_alias="BRIGHTNESS_LUX_MAX", gt=0.0
-    )
-    default_brightness: int = Field(
-        default=120, validation_alias="DEFAULT_BRIGHTNESS", ge=0, le=255
-    )
-
-    brightnessctl_bin: str = Field(
-        default="/usr/bin/brightnessctl", validation_alias="BRIGHTNESSCTL_BIN"
-    )
-    brightnessctl_device: str | None = Field(
-        default=None, validation_alias="BRIGHTNESSCTL_DEVICE"
-    )
-    backlight_path: str | None = Field(
-        default=None, validation_alias="BACKLIGHT_PATH"
-    )
-
-    log_level: str = Field(default="INFO", validation_alias="LOG_LEVEL")
-    log_json: bool = Field(default=False, validation_alias="LOG_JSON")
-
-    enable_distance_sensor: bool = Field(
-        default=True, validation_alias="ENABLE_DISTANCE_SENSOR"
-    )
-    enable_light_sensor: bool = Field(
-        default=True, validation_alias="ENABLE_LIGHT_SENSOR"
-    )
-
-    enable_vnc: bool = Field(default=False, validation_alias="ENABLE_VNC")
-    vnc_port: int = Field(default=5900, validation_alias="VNC_PORT", ge=1024, le=65535)
-    vnc_password_file: str | None = Field(
-        default=None, validation_alias="VNC_PASSWORD_FILE"
-    )
-    vnc_extra_args: str = Field(default="-shared -loop", validation_alias="VNC_EXTRA_ARGS")
-
-    @field_validator("vnc_password_file", mode="before")
-    @classmethod
-    def _empty_to_none(cls, value: str | None) -> str | None:
-        if value is None:
-            return None
-        stripped = value.strip()
-        return stripped or None
+@dataclass(frozen=True, slots=True)
+class KioskConfig:
+    ha_base_url: str
+    # Query string additions appended to the HA URL.
+    ha_extra_query: str = ""
+    ha_long_lived_token: Optional[str] = None
 
-    @field_validator("brightness_max")
-    @classmethod
-    def _validate_brightness_range(cls, value: int, info: FieldValidationInfo) -> int:
-        min_value = info.data.get("brightness_min", 0)
-        if value <= min_value:
-            raise ValueError("BRIGHTNESS_MAX must be greater than BRIGHTNESS_MIN")
-        return value
+    distance_threshold_mm: int = 1500
+    inactivity_timeout_sec: int = 90
+    poll_interval_sec: float = 0.5
+    light_poll_interval_sec: float = 2.0
+    # The one field whose env var isn't just its name upper-cased.
+    idle_sleep_max: float = field(default=5.0, metadata={"env": "IDLE_SLEEP_MAX_SEC"})
+
+    brightness_min: int = 10
+    brightness_max: int = 255
+    brightness_lux_max: float = 400.0
+    default_brightness: int = 120
+    brightness_min_delta: int = 4
+
+    brightnessctl_bin: str = "/usr/bin/brightnessctl"
+    brightnessctl_device: Optional[str] = None
+    backlight_path: Optional[str] = None
+
+    log_level: str = "INFO"
+    log_json: bool = False
+
+    enable_distance_sensor: bool = True
+    enable_light_sensor: bool = True
+    interrupt_gpio: Optional[int] = None
+
+    enable_vnc: bool = False
+    vnc_port: int = 5900
+    vnc_password_file: Optional[str] = None
+    vnc_extra_args: str = "-shared -loop"
 
-    @field_validator("log_level")
     @classmethod
-    def _validate_log_level(cls, value: str) -> str:
-        allowed = {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}
-        upper = value.upper()
-        if upper not in allowed:
-            raise ValueError(
-                f"LOG_LEVEL must be one of {', '.join(sorted(allowed))}, got {value!r}"
+    def from_env(cls, data: Mapping[str, str]) -> KioskConfig:
+        ha_base_url = data.get("HA_BASE_URL", "").strip()
+        if not _URL_RE.match(ha_base_url):
+            raise ConfigError(f"HA_BASE_URL must be an http(s) URL, got {ha_base_url!r}")
+
+        brightness_min = _int(data, "BRIGHTNESS_MIN", 10, ge=0, le=255)
+        brightness_max = _int(data, "BRIGHTNESS_MAX", 255, ge=1, le=255)
+        if brightness_max <= brightness_min:
+            raise ConfigError("BRIGHTNESS_MAX must be greater than BRIGHTNESS_MIN")
+
+        log_level = data.get("LOG_LEVEL", "INFO").upper()
+        if log_level not in _LOG_LEVELS:
+            raise ConfigError(
+                f"LOG_LEVEL must be one of {', '.join(sorted(_LOG_LEVELS))}, "
+                f"got {data['LOG_LEVEL']!r}"
             )
-        return upper
+
+        interrupt_gpio = _optional(data, "INTERRUPT_GPIO")
+        return cls(
+            ha_base_url=ha_base_url,
+            ha_extra_query=data.get("HA_EXTRA_QUERY", ""),
+            ha_long_lived_token=data.get("HA_LONG_LIVED_TOKEN"),
+            distance_threshold_mm=_int(data, "DISTANCE_THRESHOLD_MM", 1500, ge=100, le=5000),
+            inactivity_timeout_sec=_int(data, "INACTIVITY_TIMEOUT_SEC", 90, ge=5, le=3600),
+            poll_interval_sec=_float(data, "POLL_INTERVAL_SEC", 0.5, ge=0.1, le=5.0),
+            light_poll_interval_sec=_float(
+                data, "LIGHT_POLL_INTERVAL_SEC", 2.0, ge=0.1, le=60.0
+            ),
+            idle_sleep_max=_float(data, "IDLE_SLEEP_MAX_SEC", 5.0, ge=0.1, le=60.0),
+            brightness_min=brightness_min,
+            brightness_max=brightness_max,
+            brightness_lux_max=_float(data, "BRIGHTNESS_LUX_MAX", 400.0, gt=0.0),
+            default_brightness=_int(data, "DEFAULT_BRIGHTNESS", 120, ge=0, le=255),
+            brightness_min_delta=_int(data, "BRIGHTNESS_MIN_DELTA", 4, ge=1, le=255),
+            brightnessctl_bin=data.get("BRIGHTNESSCTL_BIN", "/usr/bin/brightnessctl"),
+            brightnessctl_device=data.get("BRIGHTNESSCTL_DEVICE"),
+            backlight_path=data.get("BACKLIGHT_PATH"),
+            log_level=log_level,
+            log_json=_bool(data, "LOG_JSON", False),
+            enable_distance_sensor=_bool(data, "ENABLE_DISTANCE_SENSOR", True),
+            enable_light_sensor=_bool(data, "ENABLE_LIGHT_SENSOR", True),
+            interrupt_gpio=(
+                None
+                if interrupt_gpio is None
+                else _int(data, "INTERRUPT_GPIO", 0, ge=0, le=27)
+            ),
+            enable_vnc=_bool(data, "ENABLE_VNC", False),
+            vnc_port=_int(data, "VNC_PORT", 5900, ge=1024, le=65535),
+            vnc_password_file=_optional(data, "VNC_PASSWORD_FILE"),
+            vnc_extra_args=data.get("VNC_EXTRA_ARGS", "-shared -loop"),
+        )
 
     def as_brightness_bounds(self) -> tuple[int, int]:
         return self.brightness_min, self.brightness_max
 
 
+# Every variable KioskConfig.from_env reads; anything else in the process
+# environment is ignored.
+_ENV_KEYS = frozenset(
+    spec.metadata.get("env", spec.name.upper()) for spec in fields(KioskConfig)
+)
+
+
+def _optional(data: Mapping[str, str], key: str) -> Optional[str]:
+    value = data.get(key)
+    if value is None:
+        return None
+    return value.strip() or None
+
+
+def _check_range(
+    key: str,
+    value: float,
+    ge: Optional[float] = None,
+    le: Optional[float] = None,
+    gt: Optional[float] = None,
+) -> None:
+    if ge is not None and value < ge:
+        raise ConfigError(f"{key} must be >= {ge}, got {value}")
+    if gt is not None and value <= gt:
+        raise ConfigError(f"{key} must be > {gt}, got {value}")
+    if le is not None and value > le:
+        raise ConfigError(f"{key} must be <= {le}, got {value}")
+
+
+def _int(
+    data: Mapping[str, str],
+    key: str,
+    default: int,
+    ge: Optional[int] = None,
+    le: Optional[int] = None,
+) -> int:
+    raw = data.get(key)
+    if raw is None:
+        return default
+    try:
+        value = int(raw.strip())
+    except ValueError:
+        raise ConfigError(f"{key} must be an integer, got {raw!r}") from None
+    _check_range(key, value, ge=ge, le=le)
+    return value
+
+
+def _float(
+    data: Mapping[str, str],
+    key: str,
+    default: float,
+    ge: Optional[float] = None,
+    le: Optional[float] = None,
+    gt: Optional[float] = None,
+) -> float:
+    raw = data.get(key)
+    if raw is None:
+        return default
+    try:
+        value = float(raw.strip())
+    except ValueError:
+        raise ConfigError(f"{key} must be a number, got {raw!r}") from None
+    # NaN slips through every range comparison below.
+    if not math.isfinite(value):
+        raise ConfigError(f"{key} must be a finite number, got {raw!r}")
+    _check_range(key, value, ge=ge, le=le, gt=gt)
+    return value
+
+
+def _bool(data: Mapping[str, str], key: str, default: bool) -> bool:
+    raw = data.get(key)
+    if raw is None:
+        return default
+    lowered = raw.strip().lower()
+    if lowered in _TRUE_VALUES:
+        return True
+    if lowered in _FALSE_VALUES:
+        return False
+    raise ConfigError(f"{key} must be a boolean, got {raw!r}")
+
+
 def parse_env_lines(lines: Iterable[str]) -> dict[str, str]:
     data: dict[str, str] = {}
     for raw_line in lines:
@@ -127,12 +207,11 @@ def parse_env_lines(lines: Iterable[str]) -> dict[str, str]:
         value = raw_value.strip()
         if not key:
             continue
-        if value:
-            try:
-                tokens = shlex.split(value, posix=True)
-                parsed = tokens[0] if tokens else ""
-            except ValueError:
-                parsed = value
+        quote = value[:1]
+        if quote in ("'", '"') and (end := value.find(quote, 1)) > 0:
+            parsed = value[1:end]
+        elif value:
+            parsed = value.split(None, 1)[0]
         else:
             parsed = ""
         data[key] = parsed
@@ -150,9 +229,6 @@ def load_config(path: Path | str | None = None) -> KioskConfig:
             raise ConfigError(f"Unable to read config file {env_path}: {exc}") from exc
 
     # Environment variables override file values.
-    data.update({k: v for k, v in os.environ.items()})
+    data.update((k, v) for k, v in os.environ.items() if k in _ENV_KEYS)
 
-    try:
-        return KioskConfig.model_validate(data)
-    except ValidationError as exc:  # pragma: no cover - validation error surfaces to logs
-        raise ConfigError(str(exc)) from exc
+    return KioskConfig.from_env(data)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import glob
 import logging
 import os
 import subprocess
@@ -8,6 +9,14 @@ from typing import Optional
 
 from .config import KioskConfig
 
+BACKLIGHT_GLOB = "/sys/class/backlight/*/brightness"
+
+# Number of lux buckets between 0 and BRIGHTNESS_LUX_MAX in the lookup table.
+_LUX_BUCKETS = 256
+
+# Weight of the newest lux sample in the smoothed value.
+_LUX_EMA_ALPHA = 0.2
+
 
 @dataclass(slots=True)
 class DisplayState:
@@ -21,50 +30,91 @@ class ScreenController:
         self._logger = logger
         self._state = DisplayState()
         self._warned_brightness = False
+        self._lux_ema: Optional[float] = None
+        self._lux_scale = _LUX_BUCKETS / max(1.0, config.brightness_lux_max)
+        self._lux_table = self._build_lux_table()
 
         self._brightnessctl_bin = config.brightnessctl_bin
         self._brightnessctl_device = config.brightnessctl_device
-        self._backlight_path = config.backlight_path
+        self._backlight_path = self._discover_backlight_path()
+        self._backlight_fd = self._open_backlight()
+        self._backlight_max = self._read_backlight_max()
+        self._brightnessctl_available = bool(self._brightnessctl_bin) and os.path.exists(
+            self._brightnessctl_bin
+        )
+        self._display_env = self._build_display_env()
+        # Persistent X connection for DPMS; opened lazily since the sensor
+        # service can start before Xorg does.
+        self._xlib_available = True
+        self._x_display = None
 
     @property
     def state(self) -> DisplayState:
         return self._state
 
-    def brightness_from_lux(self, lux: Optional[float]) -> int:
+    def close(self) -> None:
+        fd = self._backlight_fd
+        self._backlight_fd = None
+        if fd is not None:
+            os.close(fd)
+        self._disconnect_x()
+
+    def brightness_from_lux(self, lux: Optional[float], fresh: bool = True) -> int:
         if lux is None:
             self._logger.debug("Lux unavailable, using default brightness %s", self._config.default_brightness)
             return self._config.default_brightness
 
+        # Only new samples move the average; repeats of a cached reading would
+        # otherwise weight it by the poll/light cadence ratio.
+        if self._lux_ema is None:
+            self._lux_ema = lux
+        elif fresh:
+            self._lux_ema = _LUX_EMA_ALPHA * lux + (1.0 - _LUX_EMA_ALPHA) * self._lux_ema
+        return self._lux_table[min(_LUX_BUCKETS, int(self._lux_ema * self._lux_scale))]
+
+    def _build_lux_table(self) -> bytes:
         min_b, max_b = self._config.as_brightness_bounds()
-        ratio = min(1.0, lux / max(1.0, self._config.brightness_lux_max))
-        value = int(min_b + (max_b - min_b) * ratio)
-        return max(min_b, min(max_b, value))
+        return bytes(
+            int(min_b + (max_b - min_b) * i / _LUX_BUCKETS) for i in range(_LUX_BUCKETS + 1)
+        )
 
     def wake_screen(self) -> None:
         if self._state.screen_on:
             return
         self._logger.info("Waking screen")
-        self._run_display_cmd(["xset", "dpms", "force", "on"])
+        if not self._force_dpms(on=True):
+            self._run_display_cmd(["xset", "dpms", "force", "on"])
         self._state.screen_on = True
+        # The room may have changed completely while blank; start over.
+        self._lux_ema = None
 
     def sleep_screen(self) -> None:
         if not self._state.screen_on:
             return
         self._logger.info("Blanking screen")
-        self._run_display_cmd(["xset", "dpms", "force", "off"])
+        if not self._force_dpms(on=False):
+            self._run_display_cmd(["xset", "dpms", "force", "off"])
         self._state.screen_on = False
 
     def set_brightness(self, target: int) -> None:
         min_b, max_b = self._config.as_brightness_bounds()
         target = int(max(min_b, min(max_b, target)))
 
-        if self._state.brightness == target:
+        current = self._state.brightness
+        if current == target:
+            return
+        # Small steps are noise, except that the clamp bounds must stay reachable.
+        if (
+            current is not None
+            and min_b < target < max_b
+            and abs(current - target) < self._config.brightness_min_delta
+        ):
             return
 
-        if self._use_brightnessctl(target):
-            self._logger.debug("Brightness set via brightnessctl: %s", target)
-        elif self._write_backlight_file(target):
+        if self._write_backlight_file(target):
             self._logger.debug("Brightness set via backlight file: %s", target)
+        elif self._use_brightnessctl(target):
+            self._logger.debug("Brightness set via brightnessctl: %s", target)
         else:
             if not self._warned_brightness:
                 self._logger.warning(
@@ -77,7 +127,7 @@ class ScreenController:
         self._state.brightness = target
 
     def _use_brightnessctl(self, target: int) -> bool:
-        if not self._brightnessctl_bin or not os.path.exists(self._brightnessctl_bin):
+        if not self._brightnessctl_available:
             return False
 
         args = [self._brightnessctl_bin]
@@ -93,24 +143,118 @@ class ScreenController:
         )
         return False
 
-    def _write_backlight_file(self, target: int) -> bool:
+    def _discover_backlight_path(self) -> Optional[str]:
+        if self._config.backlight_path:
+            return self._config.backlight_path
+        device = self._brightnessctl_device or ""
+        if device.startswith("backlight/"):
+            candidate = f"/sys/class/backlight/{device.partition('/')[2]}/brightness"
+            if os.path.exists(candidate):
+                return candidate
+        matches = sorted(glob.glob(BACKLIGHT_GLOB))
+        return matches[0] if matches else None
+
+    def _open_backlight(self) -> Optional[int]:
         if not self._backlight_path:
+            return None
+        try:
+            return os.open(self._backlight_path, os.O_WRONLY)
+        except OSError as exc:
+            self._logger.info(
+                "Backlight file %s not writable (%s); falling back to brightnessctl",
+                self._backlight_path,
+                exc,
+            )
+            return None
+
+    def _read_backlight_max(self) -> Optional[int]:
+        if self._backlight_fd is None:
+            return None
+        max_path = os.path.join(os.path.dirname(self._backlight_path), "max_brightness")
+        try:
+            with open(max_path, encoding="ascii") as handle:
+                return int(handle.read().strip())
+        except (OSError, ValueError) as exc:
+            self._logger.debug("Unable to read %s: %s", max_path, exc)
+            return None
+
+    def _write_backlight_file(self, target: int) -> bool:
+        fd = self._backlight_fd
+        if fd is None:
             return False
+        # The kernel rejects values above max_brightness; clamp like
+        # brightnessctl does.
+        if self._backlight_max is not None:
+            target = min(target, self._backlight_max)
         try:
-            with open(self._backlight_path, "w", encoding="ascii") as handle:
-                handle.write(str(target))
+            os.pwrite(fd, b"%d" % target, 0)
             return True
         except OSError as exc:  # pragma: no cover - hardware specific
-            self._logger.warning("Failed writing %s: %s", self._backlight_path, exc)
+            self._logger.warning(
+                "Failed writing %s (%s); falling back to brightnessctl",
+                self._backlight_path,
+                exc,
+            )
+            self._backlight_fd = None
+            os.close(fd)
             return False
 
-    def _run_display_cmd(self, args: list[str]) -> None:
+    def _force_dpms(self, on: bool) -> bool:
+        display = self._x_display or self._connect_x()
+        if display is None:
+            return False
+        try:
+            from Xlib.ext import dpms  # type: ignore
+
+            # Same sequence as `xset dpms force`: forcing needs DPMS enabled.
+            display.dpms_enable()
+            display.dpms_force_level(dpms.DPMSModeOn if on else dpms.DPMSModeOff)
+            display.sync()
+            return True
+        except Exception as exc:  # pragma: no cover - X server specific
+            self._logger.debug("DPMS request failed, reconnecting next time: %s", exc)
+            self._disconnect_x()
+            return False
+
+    def _connect_x(self):
+        if not self._xlib_available:
+            return None
+        try:
+            from Xlib import display as xdisplay  # type: ignore
+        except ImportError:
+            self._logger.debug("python-xlib not installed; using xset for DPMS")
+            self._xlib_available = False
+            return None
+        try:
+            display = xdisplay.Display(self._display_env["DISPLAY"])
+            if not display.has_extension("DPMS"):
+                self._logger.debug("X server lacks DPMS; using xset")
+                display.close()
+                self._xlib_available = False
+                return None
+        except Exception as exc:  # pragma: no cover - X server specific
+            self._logger.debug("Unable to connect to X display: %s", exc)
+            return None
+        self._x_display = display
+        return display
+
+    def _disconnect_x(self) -> None:
+        display = self._x_display
+        self._x_display = None
+        if display is not None:
+            try:
+                display.close()
+            except Exception:  # pragma: no cover - X server specific
+                pass
+
+    @staticmethod
+    def _build_display_env() -> dict[str, str]:
         env = os.environ.copy()
-        env.setdefault("DISPLAY", os.getenv("DISPLAY", ":0"))
-        xauthority = os.getenv("XAUTHORITY")
-        if xauthority:
-            env["XAUTHORITY"] = xauthority
-        if not self._run(args, env=env):
+        env.setdefault("DISPLAY", ":0")
+        return env
+
+    def _run_display_cmd(self, args: list[str]) -> None:
+        if not self._run(args, env=self._display_env):
             self._logger.warning("Failed to run display command: %s", args)
 
     def _run(self, args: list[str], env: Optional[dict[str, str]] = None) -> bool:
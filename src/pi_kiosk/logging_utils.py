@@ -2,27 +2,69 @@ from __future__ import annotations
 
 import json
 import logging
+import math
 import sys
-from datetime import datetime, timezone
+import time
 from typing import Any, Dict
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 LOGGER_NAME = "pi_kiosk"
 
 
 class JsonFormatter(logging.Formatter):
+    def __init__(self) -> None:
+        super().__init__()
+        # Records arrive in bursts within the same second; reuse its prefix.
+        self._cached_second = -1
+        self._cached_prefix = ""
+
     def format(self, record: logging.LogRecord) -> str:
+        if record.args or not isinstance(record.msg, str):
+            message = record.getMessage()
+        else:
+            message = record.msg
         payload: Dict[str, Any] = {
-            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
-            "message": record.getMessage(),
+            "message": message,
             "logger": record.name,
         }
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
         if record.stack_info:
             payload["stack"] = self.formatStack(record.stack_info)
+        if orjson is not None:
+            try:
+                encoded = orjson.dumps(payload).decode()
+            except orjson.JSONEncodeError:
+                # Lone surrogates (e.g. from surrogateescape'd paths) are
+                # rejected by orjson; the stdlib escapes them.
+                pass
+            else:
+                # orjson has no ensure_ascii; keep the stdlib's escaped output.
+                if encoded.isascii():
+                    return encoded
         return json.dumps(payload, separators=(",", ":"))
 
+    def _timestamp(self, created: float) -> str:
+        # Same rounding and shape as datetime.fromtimestamp(...).isoformat().
+        frac, whole = math.modf(created)
+        second = int(whole)
+        micros = round(frac * 1e6)
+        if micros >= 1_000_000:
+            second += 1
+            micros -= 1_000_000
+        if second != self._cached_second:
+            self._cached_second = second
+            self._cached_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        if micros:
+            return "%s.%06d+00:00" % (self._cached_prefix, micros)
+        return self._cached_prefix + "+00:00"
+
 
 def setup_logging(level: str = "INFO", json_enabled: bool = False) -> logging.Logger:
     logger = logging.getLogger(LOGGER_NAME)
@@ -47,39 +47,115 @@ def run(argv: Optional[list[str]] = None) -> None:
         logger.info("Received signal %s, shutting down", signum)
         running = False
 
+    ticked = False
+
+    def _tick(_signum: int, _frame) -> None:
+        nonlocal ticked
+        ticked = True
+
     signal.signal(signal.SIGTERM, _shutdown)
     signal.signal(signal.SIGINT, _shutdown)
-
-    last_motion_ts = time.monotonic()
+    signal.signal(signal.SIGALRM, _tick)
+
+    # Bind everything the loop touches once; this runs several times a second
+    # for the lifetime of the kiosk.
+    mono = time.monotonic
+    pause = signal.pause
+    debug = logger.debug
+    sensor_read = sensors.read
+    sensor_wait = sensors.wait_for_readings
+    read_light = sensors.read_light
+    set_distance_period = sensors.set_distance_period
+    wake = screen.wake_screen
+    blank = screen.sleep_screen
+    set_b = screen.set_brightness
+    b_from_lux = screen.brightness_from_lux
+    display_state = screen.state
+    distance_enabled = config.enable_distance_sensor
+    dist_thr = config.distance_threshold_mm
+    inact = config.inactivity_timeout_sec
+    poll = config.poll_interval_sec
+    idle_max = config.idle_sleep_max
+
+    last_motion_ts = mono()
     last_health_log = 0.0
+    consecutive_idle_polls = 0
+    interval = poll
+    armed_interval = 0.0
 
     while running:
-        readings = sensors.read()
-        now = time.monotonic()
-
-        distance_capable = config.enable_distance_sensor and sensors.distance_supported
-
-        if readings.distance_mm is not None:
-            logger.debug("Distance reading: %.2f mm", readings.distance_mm)
-            if readings.distance_mm <= config.distance_threshold_mm:
+        # With the ToF interrupt wired up, block until it signals a fresh
+        # range instead of sleeping and then polling the bus.
+        interrupt_driven = sensors.distance_interrupt_driven
+        # Ambient light only matters while the panel is lit.
+        skip_lux = not display_state.screen_on
+        if interrupt_driven:
+            # The sensor ranges every `interval`; allow a full extra period
+            # before treating the wait as a missed interrupt.
+            readings = sensor_wait(interval * 2, skip_lux=skip_lux)
+        else:
+            readings = sensor_read(skip_lux=skip_lux)
+        now = mono()
+        distance_mm = readings.distance_mm
+        ambient_lux = readings.ambient_lux
+
+        distance_capable = distance_enabled and sensors.distance_supported
+
+        if distance_mm is not None:
+            debug("Distance reading: %.2f mm", distance_mm)
+            if distance_mm <= dist_thr:
                 last_motion_ts = now
-                screen.wake_screen()
+                if not display_state.screen_on:
+                    wake()
+                    # Lux was skipped while blank; don't light the panel
+                    # from a reading taken before it went dark.
+                    readings = read_light()
+                    ambient_lux = readings.ambient_lux
 
-        if distance_capable and (now - last_motion_ts) > config.inactivity_timeout_sec:
-            screen.sleep_screen()
+        if distance_capable and (now - last_motion_ts) > inact:
+            blank()
 
-        brightness = screen.brightness_from_lux(readings.ambient_lux)
-        screen.set_brightness(brightness)
+        if display_state.screen_on:
+            brightness = b_from_lux(ambient_lux, readings.lux_fresh)
+            set_b(brightness)
 
-        if readings.ambient_lux is not None:
-            logger.debug("Ambient lux: %.2f -> brightness %s", readings.ambient_lux, brightness)
+            if ambient_lux is not None:
+                debug("Ambient lux: %.2f -> brightness %s", ambient_lux, brightness)
 
         if now - last_health_log >= 60:
             last_health_log = now
             logger.info("Sensor health: %s", sensors.health_snapshot())
 
-        time.sleep(config.poll_interval_sec)
-
+        # Back off geometrically while the screen is blank; a wake snaps back
+        # to the base cadence. Lux isn't read while blank, so it can't factor in.
+        if not display_state.screen_on:
+            interval = min(idle_max, poll * (2 ** consecutive_idle_polls))
+            if interval < idle_max:
+                consecutive_idle_polls += 1
+        else:
+            consecutive_idle_polls = 0
+            interval = poll
+
+        if interrupt_driven:
+            # Let the sensor's own cadence follow the idle backoff.
+            set_distance_period(interval)
+            if armed_interval:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                armed_interval = 0.0
+        else:
+            # Idle in pause() until the interval timer fires. The timer is
+            # periodic so a tick that lands just before pause() only costs one
+            # extra period instead of hanging the loop.
+            if interval != armed_interval:
+                ticked = False
+                signal.setitimer(signal.ITIMER_REAL, interval, interval)
+                armed_interval = interval
+            while running and not ticked:
+                pause()
+            ticked = False
+
+    signal.setitimer(signal.ITIMER_REAL, 0)
+    screen.close()
     logger.info("Pi Kiosk controller exiting")
 
 
@@ -1,27 +1,58 @@
 from __future__ import annotations
 
 import logging
+import struct
 import time
 from dataclasses import dataclass
 from typing import Optional
 
 from .config import KioskConfig
 
+# Raw register map used on the hot path; the Adafruit drivers are only used to
+# bring the sensors up. VL53L4CD registers take a 16-bit big-endian address.
+_VL53L4CD_ADDR = 0x29
+_VL53L4CD_GPIO_TIO_HV_STATUS = b"\x00\x31"
+_VL53L4CD_RESULT_DISTANCE = b"\x00\x96"
+_VL53L4CD_CLEAR_INTERRUPT = b"\x00\x86\x01"
+_VEML7700_ADDR = 0x10
+_VEML7700_ALS = b"\x04"
+
+_VL53L4CD_TIMING_BUDGET_MS = 200
+# Autonomous mode needs a gap longer than the timing budget.
+_VL53L4CD_MIN_INTER_MEASUREMENT_MS = _VL53L4CD_TIMING_BUDGET_MS + 5
+# Consecutive waits where GPIO1 disagrees with the status register (timed out
+# with a range ready, or fired with none) before we decide the interrupt line
+# is miswired or stuck and go back to polling.
+_INTERRUPT_FAULT_LIMIT = 3
+
+_U16_BE = struct.Struct(">H")
+_U16_LE = struct.Struct("<H")
+
+# Both sensors support Fast-mode I²C.
+_I2C_FREQUENCY = 400_000
+
 
 @dataclass(slots=True)
 class SensorReadings:
     distance_mm: Optional[float] = None
     ambient_lux: Optional[float] = None
+    # False when ambient_lux is the cached value from an earlier light read.
+    lux_fresh: bool = False
 
 
 class _BaseSensor:
-    def __init__(self, name: str, logger: logging.Logger, enabled: bool) -> None:
+    def __init__(
+        self, name: str, logger: logging.Logger, enabled: bool, period: float
+    ) -> None:
         self._name = name
         self._logger = logger.getChild(name)
         self._enabled = enabled
         self._sensor = None
         self._fail_count = 0
         self._next_attempt = 0.0
+        # Read cadence; the suite skips the sensor until next_due_ts.
+        self.period = period
+        self.next_due_ts = 0.0
 
     def is_supported(self) -> bool:
         return self._sensor is not None
@@ -34,7 +65,7 @@ class _BaseSensor:
 
     def _backoff(self) -> None:
         self._fail_count += 1
-        delay = min(2 ** self._fail_count, 60)
+        delay = min(2 ** (self._fail_count - 1), 60)
         self._next_attempt = time.monotonic() + delay
         if self._fail_count in (1, 3, 5):
             self._logger.warning(
@@ -59,25 +90,101 @@ class _BaseSensor:
 
 
 class DistanceSensor(_BaseSensor):
-    def __init__(self, logger: logging.Logger, enabled: bool, i2c) -> None:
-        super().__init__("distance", logger, enabled)
+    def __init__(
+        self,
+        logger: logging.Logger,
+        enabled: bool,
+        i2c,
+        period: float = 0.5,
+        interrupt_gpio: Optional[int] = None,
+    ) -> None:
+        super().__init__("distance", logger, enabled, period)
         self._i2c = i2c
+        self._interrupt_gpio = interrupt_gpio
+        self._interrupt_pin = None
+        self._interrupt_failed = False
+        self._interrupt_polarity = 1
+        self._ranging_ms = 0
+        self._interrupt_faults = 0
+        self._polled_ready = False
         if self._enabled:
             self._attempt_init()
 
-    def read(self) -> Optional[float]:
-        if not self._ready():
-            return None
+    @property
+    def interrupt_driven(self) -> bool:
+        return self._interrupt_pin is not None and self._sensor is not None
+
+    def disable(self) -> None:
+        super().disable()
+        self._close_interrupt_pin()
+
+    def wait_for_interrupt(self, timeout: float) -> bool:
+        """Block until GPIO1 signals a fresh range or ``timeout`` elapses."""
+        pin = self._interrupt_pin
+        self._polled_ready = False
+        if pin is None or not self._ready():
+            return False
         try:
-            sensor = self._sensor
-            if sensor is None:
-                return None
-            if hasattr(sensor, "data_ready") and not sensor.data_ready:
-                return None
-            distance = getattr(sensor, "distance", None)
-            if hasattr(sensor, "clear_interrupt"):
-                sensor.clear_interrupt()
-            if not distance or distance <= 0:
+            return bool(pin.wait_for_active(timeout))
+        except Exception as exc:  # pragma: no cover - hardware specific
+            self._logger.debug("Distance interrupt wait error: %s", exc)
+            return False
+
+    def check_interrupt(self, fired: bool) -> None:
+        """Compare a wait's outcome with the status read that followed it;
+        gives up on the pin if the two keep disagreeing."""
+        if self._interrupt_pin is None:
+            return
+        if fired == self._polled_ready:
+            if fired:
+                self._interrupt_faults = 0
+            return
+        self._interrupt_faults += 1
+        if self._interrupt_faults < _INTERRUPT_FAULT_LIMIT:
+            return
+        self._logger.warning(
+            "GPIO%s does not follow data-ready (%s); falling back to polling",
+            self._interrupt_gpio,
+            "stuck asserted" if fired else "never asserts",
+        )
+        self._interrupt_failed = True
+        self._close_interrupt_pin()
+        self.set_ranging_period(self.period)
+
+    def set_ranging_period(self, seconds: float) -> None:
+        """Retune autonomous ranging so data-ready interrupts follow the loop."""
+        sensor = self._sensor
+        if sensor is None or not self._ranging_ms:
+            return
+        ms = max(int(seconds * 1000), _VL53L4CD_MIN_INTER_MEASUREMENT_MS)
+        if ms == self._ranging_ms:
+            return
+        try:
+            sensor.stop_ranging()
+            sensor.inter_measurement = ms
+            sensor.start_ranging()
+            self._ranging_ms = ms
+        except Exception as exc:  # pragma: no cover - hardware specific
+            self._logger.debug("Distance ranging period change failed: %s", exc)
+            self._sensor = None
+            self._backoff()
+
+    def read_registers(self, buf: bytearray, check_ready: bool = True) -> Optional[float]:
+        """Read the latest range (mm) directly; the caller holds the bus lock."""
+        i2c = self._i2c
+        self._polled_ready = False
+        try:
+            if check_ready:
+                i2c.writeto_then_readfrom(
+                    _VL53L4CD_ADDR, _VL53L4CD_GPIO_TIO_HV_STATUS, buf, in_end=1
+                )
+                if buf[0] & 0x01 != self._interrupt_polarity:
+                    return None
+                self._polled_ready = True
+            i2c.writeto_then_readfrom(_VL53L4CD_ADDR, _VL53L4CD_RESULT_DISTANCE, buf)
+            i2c.writeto(_VL53L4CD_ADDR, _VL53L4CD_CLEAR_INTERRUPT)
+            distance = _U16_BE.unpack_from(buf)[0]
+            if distance <= 0:
                 return None
             self._fail_count = 0
             return float(distance)
@@ -98,40 +205,71 @@ class DistanceSensor(_BaseSensor):
             import adafruit_vl53l4cd  # type: ignore
 
             sensor = adafruit_vl53l4cd.VL53L4CD(self._i2c)
+            interrupt = self._interrupt_gpio is not None
+            self._ranging_ms = (
+                max(int(self.period * 1000), _VL53L4CD_MIN_INTER_MEASUREMENT_MS)
+                if interrupt
+                else 0
+            )
             try:
-                sensor.inter_measurement = 0
-                sensor.timing_budget = 200
+                sensor.timing_budget = _VL53L4CD_TIMING_BUDGET_MS
+                sensor.inter_measurement = self._ranging_ms
                 sensor.start_ranging()
             except Exception:
                 self._logger.debug("start_ranging not supported on this sensor")
+            # Data-ready polarity is probed by the driver during init.
+            self._interrupt_polarity = getattr(sensor, "_interrupt_polarity", 1)
             self._sensor = sensor
             self._fail_count = 0
+            if interrupt and self._interrupt_pin is None and not self._interrupt_failed:
+                self._open_interrupt_pin()
             self._logger.info("Distance sensor ready")
         except Exception as exc:  # pragma: no cover - hardware specific
             self._logger.warning("Unable to initialize distance sensor: %s", exc)
             self._sensor = None
             self._backoff()
 
+    def _open_interrupt_pin(self) -> None:
+        try:
+            from gpiozero import DigitalInputDevice  # type: ignore
+
+            # GPIO1 is open-drain and pulled low while a result is pending.
+            self._interrupt_pin = DigitalInputDevice(self._interrupt_gpio, pull_up=True)
+            self._logger.info("Distance interrupt on GPIO%s", self._interrupt_gpio)
+        except Exception as exc:  # pragma: no cover - hardware specific
+            self._logger.warning(
+                "Unable to open interrupt GPIO%s; falling back to polling: %s",
+                self._interrupt_gpio,
+                exc,
+            )
+            self._interrupt_pin = None
+
+    def _close_interrupt_pin(self) -> None:
+        pin = self._interrupt_pin
+        self._interrupt_pin = None
+        if pin is not None:
+            try:
+                pin.close()
+            except Exception:  # pragma: no cover - hardware specific
+                pass
+
 
 class LightSensor(_BaseSensor):
-    def __init__(self, logger: logging.Logger, enabled: bool, i2c) -> None:
-        super().__init__("light", logger, enabled)
+    def __init__(
+        self, logger: logging.Logger, enabled: bool, i2c, period: float = 2.0
+    ) -> None:
+        super().__init__("light", logger, enabled, period)
         self._i2c = i2c
+        self._resolution = 0.0
         if self._enabled:
             self._attempt_init()
 
-    def read(self) -> Optional[float]:
-        if not self._ready():
-            return None
+    def read_registers(self, buf: bytearray) -> Optional[float]:
+        """Read the ALS channel directly; the caller holds the bus lock."""
         try:
-            sensor = self._sensor
-            if sensor is None:
-                return None
-            lux = getattr(sensor, "lux", None)
-            if lux is None:
-                return None
+            self._i2c.writeto_then_readfrom(_VEML7700_ADDR, _VEML7700_ALS, buf)
             self._fail_count = 0
-            return float(lux)
+            return _U16_LE.unpack_from(buf)[0] * self._resolution
         except Exception as exc:  # pragma: no cover - hardware specific
             self._logger.debug("Lux read error: %s", exc)
             self._sensor = None
@@ -148,7 +286,10 @@ class LightSensor(_BaseSensor):
         try:
             import adafruit_veml7700  # type: ignore
 
-            self._sensor = adafruit_veml7700.VEML7700(self._i2c)
+            sensor = adafruit_veml7700.VEML7700(self._i2c)
+            # Lux per ALS count for the gain/integration time set at init.
+            self._resolution = sensor.resolution()
+            self._sensor = sensor
             self._fail_count = 0
             self._logger.info("Light sensor ready")
         except Exception as exc:  # pragma: no cover - hardware specific
@@ -162,8 +303,25 @@ class SensorSuite:
         self._logger = logger
         self._config = config
         self._i2c = self._init_i2c_bus()
-        self.distance = DistanceSensor(logger, config.enable_distance_sensor, self._i2c)
-        self.light = LightSensor(logger, config.enable_light_sensor, self._i2c)
+        # Reused for every raw register read so the hot path never allocates
+        # transfer buffers. The distance buffer also holds the 1-byte status.
+        self._distance_buf = bytearray(2)
+        self._lux_buf = bytearray(2)
+        self.distance = DistanceSensor(
+            logger,
+            config.enable_distance_sensor,
+            self._i2c,
+            period=config.poll_interval_sec,
+            interrupt_gpio=config.interrupt_gpio,
+        )
+        self.light = LightSensor(
+            logger,
+            config.enable_light_sensor,
+            self._i2c,
+            period=config.light_poll_interval_sec,
+        )
+        # Lux changes slowly, so between light reads the last value stands in.
+        self._last_lux: Optional[float] = None
 
     def _init_i2c_bus(self):
         if not (self._config.enable_distance_sensor or self._config.enable_light_sensor):
@@ -173,17 +331,81 @@ class SensorSuite:
             import busio  # type: ignore
 
             self._logger.debug("Initializing I²C bus")
-            return busio.I2C(board.SCL, board.SDA)
+            return busio.I2C(board.SCL, board.SDA, frequency=_I2C_FREQUENCY)
         except Exception as exc:  # pragma: no cover - hardware specific
             self._logger.warning("Unable to initialize I²C bus: %s", exc)
             return None
 
-    def read(self) -> SensorReadings:
-        readings = SensorReadings()
-        readings.distance_mm = self.distance.read()
-        readings.ambient_lux = self.light.read()
+    def read(self, skip_lux: bool = False) -> SensorReadings:
+        now = time.monotonic()
+        return self._read_batch(
+            distance=self._due(self.distance, now),
+            light=not skip_lux,
+            check_ready=True,
+            now=now,
+        )
+
+    def wait_for_readings(self, timeout: float, skip_lux: bool = False) -> SensorReadings:
+        fired = self.distance.wait_for_interrupt(timeout)
+        # Confirm with the status register either way: a dead line must not
+        # stall distance readings, and a stuck one must not spin the loop.
+        readings = self._read_batch(
+            distance=True, light=not skip_lux, check_ready=True, now=time.monotonic()
+        )
+        self.distance.check_interrupt(fired)
         return readings
 
+    def set_distance_period(self, seconds: float) -> None:
+        self.distance.set_ranging_period(seconds)
+
+    def read_light(self) -> SensorReadings:
+        """Read lux right away, regardless of the light schedule."""
+        self.light.next_due_ts = 0.0
+        return self._read_batch(
+            distance=False, light=True, check_ready=True, now=time.monotonic()
+        )
+
+    @staticmethod
+    def _due(sensor: _BaseSensor, now: float) -> bool:
+        # The loop timer can share the sensor's period, so wakeups jitter
+        # around the due time; half a period of slack absorbs that, and the
+        # schedule advances on its own grid rather than from ``now``.
+        if now < sensor.next_due_ts - sensor.period / 2:
+            return False
+        sensor.next_due_ts += sensor.period
+        if sensor.next_due_ts <= now:
+            sensor.next_due_ts = now + sensor.period
+        return True
+
+    def _read_batch(
+        self, distance: bool, light: bool, check_ready: bool, now: float
+    ) -> SensorReadings:
+        readings = SensorReadings(ambient_lux=self._last_lux)
+        # Readiness may (re)initialize a driver, which takes the lock itself.
+        distance_ready = distance and self.distance._ready()
+        light_ready = light and self._due(self.light, now) and self.light._ready()
+        if not (distance_ready or light_ready):
+            return readings
+
+        i2c = self._i2c
+        while not i2c.try_lock():
+            pass
+        try:
+            if distance_ready:
+                readings.distance_mm = self.distance.read_registers(
+                    self._distance_buf, check_ready
+                )
+            if light_ready:
+                readings.ambient_lux = self._last_lux = self.light.read_registers(self._lux_buf)
+                readings.lux_fresh = True
+        finally:
+            i2c.unlock()
+        return readings
+
+    @property
+    def distance_interrupt_driven(self) -> bool:
+        return self.distance.interrupt_driven
+
     @property
     def distance_supported(self) -> bool:
         return self.distance.is_supported()
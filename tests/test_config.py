@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from pi_kiosk.config import ConfigError, KioskConfig, load_config, parse_env_lines
+
+SAMPLE_ENV = Path(__file__).resolve().parents[1] / "config" / "kiosk.env.sample"
+
+
+def _config(**overrides: str) -> KioskConfig:
+    data = {"HA_BASE_URL": "http://homeassistant.local:8123"}
+    data.update(overrides)
+    return KioskConfig.from_env(data)
+
+
+def test_sample_env_file_loads(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("HA_BASE_URL", raising=False)
+    monkeypatch.delenv("INTERRUPT_GPIO", raising=False)
+    config = load_config(SAMPLE_ENV)
+    assert config.ha_base_url == "https://homeassistant.local:8123/lovelace/kiosk"
+    assert config.ha_extra_query == "kiosk=true"
+    assert config.distance_threshold_mm == 1500
+    assert config.poll_interval_sec == 0.5
+    assert config.brightnessctl_device == "backlight/11-0045"
+    assert config.backlight_path is None
+    assert config.interrupt_gpio is None
+    assert config.vnc_password_file is None
+    assert config.vnc_extra_args == "-shared -loop"
+    assert config.log_json is False
+
+
+def test_environment_overrides_file(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    env_file = tmp_path / "kiosk.env"
+    env_file.write_text('HA_BASE_URL="http://file.local"\nVNC_PORT=5901\n')
+    monkeypatch.setenv("VNC_PORT", "5902")
+    monkeypatch.delenv("HA_BASE_URL", raising=False)
+    config = load_config(env_file)
+    assert config.ha_base_url == "http://file.local"
+    assert config.vnc_port == 5902
+
+
+@pytest.mark.parametrize(
+    ("line", "expected"),
+    [
+        ('KEY="a b c"', "a b c"),
+        ("KEY='a b c'", "a b c"),
+        ('KEY="a b" # trailing comment', "a b"),
+        ("KEY=plain # trailing comment", "plain"),
+        ('KEY=""', ""),
+        ("KEY=", ""),
+        ("  KEY = spaced  ", "spaced"),
+    ],
+)
+def test_parse_env_lines_quoting(line: str, expected: str) -> None:
+    assert parse_env_lines([line]) == {"KEY": expected}
+
+
+def test_parse_env_lines_skips_comments_and_junk() -> None:
+    lines = ["# comment", "", "no equals sign", "=value", "KEY=1"]
+    assert parse_env_lines(lines) == {"KEY": "1"}
+
+
+@pytest.mark.parametrize(("raw", "expected"), [("", None), ("  ", None), ("17", 17)])
+def test_interrupt_gpio(raw: str, expected: int | None) -> None:
+    assert _config(INTERRUPT_GPIO=raw).interrupt_gpio == expected
+
+
+@pytest.mark.parametrize(
+    ("key", "raw"),
+    [
+        ("HA_BASE_URL", "homeassistant.local"),
+        ("INTERRUPT_GPIO", "28"),
+        ("POLL_INTERVAL_SEC", "0.05"),
+        ("POLL_INTERVAL_SEC", "nan"),
+        ("POLL_INTERVAL_SEC", "inf"),
+        ("POLL_INTERVAL_SEC", "fast"),
+        ("BRIGHTNESS_LUX_MAX", "0"),
+        ("VNC_PORT", "80"),
+        ("LOG_LEVEL", "verbose"),
+        ("LOG_JSON", "maybe"),
+    ],
+)
+def test_invalid_values_rejected(key: str, raw: str) -> None:
+    with pytest.raises(ConfigError, match=key):
+        _config(**{key: raw})
+
+
+def test_missing_base_url_rejected() -> None:
+    with pytest.raises(ConfigError, match="HA_BASE_URL"):
+        KioskConfig.from_env({})
+
+
+@pytest.mark.parametrize("brightness_max", ["10", "5"])
+def test_brightness_max_must_exceed_min(brightness_max: str) -> None:
+    with pytest.raises(ConfigError, match="BRIGHTNESS_MAX"):
+        _config(BRIGHTNESS_MIN="10", BRIGHTNESS_MAX=brightness_max)